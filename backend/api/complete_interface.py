@@ -2239,6 +2239,12 @@ async def build_auto_dj_plan(data: dict):
     # Build visual roadmap
     visual_plan = set_planner.build_visual_plan(selected_tracks)
     
+    if 'transitions_details' in auto_plan:
+        auto_plan['transitions_details'] = [
+            transition_planner.plan_to_dict(plan)
+            for plan in auto_plan['transitions_details']
+        ]
+    
     return {
         **auto_plan,
         'visual': visual_plan
@@ -683,7 +683,7 @@ async def plan_transition(track_a_path: str, track_b_path: str, transition_type:
         # Plan transition
         plan = transition_planner.plan_transition(track_a, track_b, transition_type)
         
-        return plan
+        return transition_planner.plan_to_dict(plan)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
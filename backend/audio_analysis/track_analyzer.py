@@ -26,6 +26,27 @@ except ImportError:
     print("Warning: Librosa not installed. Install with: pip install librosa")
     LIBROSA_AVAILABLE = False
 
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+
+def quick_duration(audio_path: str) -> Optional[float]:
+    """
+    Track duration in seconds, read from the file header without decoding
+    
+    Returns None if soundfile is not installed or can't read the format.
+    """
+    if not SOUNDFILE_AVAILABLE:
+        return None
+    try:
+        info = sf.info(audio_path)
+    except RuntimeError:
+        return None
+    return info.frames / info.samplerate
+
 
 class TrackAnalyzer:
     """Analyze audio tracks for DJ mixing purposes"""
@@ -48,8 +48,8 @@ class AudioDeck:
         """Load audio file into deck"""
         try:
             with self.lock:
-                # Read audio file
-                audio, sr = sf.read(file_path, always_2d=True)
+                # Read audio file, decoded straight to float32
+                audio, sr = sf.read(file_path, always_2d=True, dtype='float32')
                 
                 # Resample if needed (ensure 44.1kHz)
                 if sr != self.sample_rate:
@@ -57,7 +57,8 @@ class AudioDeck:
                     num_samples = int(len(audio) * self.sample_rate / sr)
                     audio = signal.resample(audio, num_samples)
                 
-                self.audio = audio.astype(np.float32)
+                # No copy unless resampling produced float64
+                self.audio = np.ascontiguousarray(audio, dtype=np.float32)
                 self.sample_rate = 44100
                 self.position = 0
                 self.track_path = file_path
@@ -158,6 +159,14 @@ class AudioDeck:
             if not self.is_playing or self.audio is None:
                 return np.zeros((num_samples, 2), dtype=np.float32)
             
+            # Handle loop
+            looping = self.loop_enabled and self.loop_start is not None and self.loop_end is not None
+            
+            # Jump back before the end-of-track check, so a loop that ends
+            # at the end of the audio keeps playing
+            if looping and self.position >= self.loop_end:
+                self.position = self.loop_start
+            
             # Check if we've reached the end
             if self.position >= len(self.audio):
                 self.is_playing = False
@@ -166,12 +175,7 @@ class AudioDeck:
             # Get audio chunk
             end_pos = self.position + num_samples
             
-            # Handle loop
-            if self.loop_enabled and self.loop_start is not None and self.loop_end is not None:
-                if self.position >= self.loop_end:
-                    self.position = self.loop_start
-                    end_pos = self.position + num_samples
-                
+            if looping:
                 # If chunk crosses loop end, wrap around
                 if end_pos > self.loop_end:
                     first_part_len = self.loop_end - self.position
@@ -6,9 +6,13 @@ Executes transitions automatically while allowing human override
 
 import time
 import threading
-from typing import Optional, List, Dict
+from typing import TYPE_CHECKING, Optional, List, Dict
 from datetime import datetime
 
+if TYPE_CHECKING:
+    # Annotation only: keeps this file runnable as a script
+    from backend.queue_manager.transition_planner import TimelineEvent
+
 
 class AutoDJEngine:
     """Smart hybrid automation - AI does the work, human can override"""
@@ -57,13 +61,10 @@ class AutoDJEngine:
             self.queue.add_track(track)
         
         # Generate transitions
-        transitions = []
+        transitions = self.planner.plan_queue(tracks)
         total_duration = 0
         
-        for i in range(len(tracks) - 1):
-            plan = self.planner.plan_transition(tracks[i], tracks[i + 1])
-            transitions.append(plan)
-            
+        for i, plan in enumerate(transitions):
             # Add track duration minus overlap
             total_duration += tracks[i]['duration']
             if plan and 'transition' in plan:
@@ -268,7 +269,7 @@ class AutoDJEngine:
         for event in timeline:
             # Wait for event time
             elapsed = time.time() - start_time
-            wait_time = event['time'] - elapsed
+            wait_time = event.time - elapsed
             
             if wait_time > 0:
                 time.sleep(wait_time)
@@ -291,13 +292,13 @@ class AutoDJEngine:
         self.mixer.set_crossfader(1.0)
         time.sleep(1)
     
-    def _execute_timeline_event(self, event: Dict):
+    def _execute_timeline_event(self, event: 'TimelineEvent'):
         """Execute a single timeline event"""
         
-        action = event['action']
+        action = event.action
         
         # Update status
-        self.action_details = event['description']
+        self.action_details = event.description
         
         if 'deck_b' in action and 'start' in action:
             # Already started in phase 3
@@ -4,13 +4,40 @@ Set Planner - Visual timeline and roadmap generator
 Creates detailed preview of what Auto DJ will do
 """
 
+from bisect import bisect_right
+from operator import itemgetter
 from typing import List, Dict
 from datetime import timedelta
 
 
+# Timeline actions that invite a manual EQ / crossfader move
+_EQ_ACTIONS = frozenset({
+    'eq_low_cut_deck_a_start',
+    'eq_low_introduce_deck_b',
+    'eq_high_introduce_deck_b',
+    'eq_mid_introduce_deck_b'
+})
+_XFADE_ACTIONS = frozenset({
+    'crossfader_50_50',
+    'fade_out_deck_a'
+})
+
+
 class SetPlanner:
     """Generate visual set plans with detailed timelines"""
     
+    # Icons for transition timeline actions
+    _ICONS = {
+        'start_deck_b': '▶️',
+        'eq_low_cut_deck_a_start': '🎛️',
+        'eq_low_introduce_deck_b': '🎛️',
+        'eq_high_introduce_deck_b': '🎛️',
+        'eq_mid_introduce_deck_b': '🎛️',
+        'crossfader_50_50': '🎚️',
+        'fade_out_deck_a': '🎚️',
+        'deck_b_only': '✅'
+    }
+    
     def __init__(self, transition_planner):
         self.planner = transition_planner
     
@@ -27,16 +54,16 @@ class SetPlanner:
                 'message': 'Need at least 2 tracks for a set'
             }
         
+        names = [self._get_track_name(t) for t in tracks]
         timeline = []
         total_time = 0.0
         
         # First track
         timeline.append({
             'time': 0.0,
-            'time_str': '00:00',
             'action': 'start_set',
             'icon': '▶️',
-            'description': f'Start playing: {self._get_track_name(tracks[0])}',
+            'description': f'Start playing: {names[0]}',
             'track_index': 0,
             'details': {
                 'bpm': tracks[0].get('bpm'),
@@ -45,13 +72,16 @@ class SetPlanner:
             }
         })
         
-        # Build transitions
+        # Plan every transition once up front
+        plans = self.planner.plan_queue(tracks)
+        
+        # Build transition timeline and summary in a single pass
+        transitions_summary = []
         for i in range(len(tracks) - 1):
             current_track = tracks[i]
             next_track = tracks[i + 1]
             
-            # Get transition plan
-            plan = self.planner.plan_transition(current_track, next_track)
+            plan = plans[i]
             
             if not plan:
                 continue
@@ -65,11 +95,24 @@ class SetPlanner:
                 plan, 
                 total_time,
                 i + 1,
-                next_track
+                names[i + 1]
             )
             
             timeline.extend(transition_events)
             
+            transitions_summary.append({
+                'from': names[i],
+                'to': names[i + 1],
+                'duration': plan['transition'].get('duration', 30),
+                'method': plan['transition'].get('method', 'standard'),
+                'compatibility': plan.get('compatibility', 0.5),
+                'bpm_diff': abs(current_track.get('bpm', 0) - next_track.get('bpm', 0)),
+                'energy_flow': self._get_energy_flow(
+                    current_track.get('energy', 0.5),
+                    next_track.get('energy', 0.5)
+                )
+            })
+            
             # Update total time (subtract overlap)
             total_time += track_duration
             overlap = plan['transition'].get('duration', 30)
@@ -79,23 +122,13 @@ class SetPlanner:
         final_track = tracks[-1]
         total_time += final_track.get('duration', 0)
         
-        # Build transitions summary
-        transitions_summary = []
-        for i in range(len(tracks) - 1):
-            plan = self.planner.plan_transition(tracks[i], tracks[i + 1])
-            if plan:
-                transitions_summary.append({
-                    'from': self._get_track_name(tracks[i]),
-                    'to': self._get_track_name(tracks[i + 1]),
-                    'duration': plan['transition'].get('duration', 30),
-                    'method': plan['transition'].get('method', 'standard'),
-                    'compatibility': plan.get('compatibility', 0.5),
-                    'bpm_diff': abs(tracks[i].get('bpm', 0) - tracks[i + 1].get('bpm', 0)),
-                    'energy_flow': self._get_energy_flow(
-                        tracks[i].get('energy', 0.5),
-                        tracks[i + 1].get('energy', 0.5)
-                    )
-                })
+        # Keep the timeline chronological: with short tracks, the load/start
+        # events of one transition can land before the end of the previous one
+        timeline.sort(key=itemgetter('time'))
+        
+        # Display times are only formatted once the timeline is complete
+        for event in timeline:
+            event['time_str'] = self._format_time(event['time'])
         
         return {
             'status': 'ok',
@@ -107,7 +140,7 @@ class SetPlanner:
             'track_list': [
                 {
                     'index': i,
-                    'name': self._get_track_name(t),
+                    'name': names[i],
                     'duration': t.get('duration', 0),
                     'bpm': t.get('bpm'),
                     'key': t.get('key'),
@@ -118,8 +151,8 @@ class SetPlanner:
         }
     
     def _build_transition_timeline(self, plan: Dict, base_time: float, 
-                                   next_index: int, next_track: Dict) -> List[Dict]:
-        """Build detailed timeline for a single transition"""
+                                   next_index: int, next_name: str) -> List[Dict]:
+        """Build detailed timeline for a single transition (without time_str)"""
         
         events = []
         transition_start = plan['track_a']['transition_start']
@@ -128,10 +161,9 @@ class SetPlanner:
         load_time = base_time + transition_start - 60
         events.append({
             'time': load_time,
-            'time_str': self._format_time(load_time),
             'action': 'load_next',
             'icon': '📀',
-            'description': f'Load to Deck B: {self._get_track_name(next_track)}',
+            'description': f'Load to Deck B: {next_name}',
             'track_index': next_index,
             'details': {
                 'deck': 'B',
@@ -143,7 +175,6 @@ class SetPlanner:
         start_time = base_time + transition_start - 30
         events.append({
             'time': start_time,
-            'time_str': self._format_time(start_time),
             'action': 'start_next',
             'icon': '▶️',
             'description': 'Start Deck B (silent on crossfader)',
@@ -156,36 +187,25 @@ class SetPlanner:
         
         # Transition events
         for event in plan['timeline']:
-            event_time = base_time + transition_start + event['time']
+            event_time = base_time + transition_start + event.time
             
-            icon = self._get_event_icon(event['action'])
-            description = event['description']
+            icon = self._get_event_icon(event.action)
+            description = event.description
             
             events.append({
                 'time': event_time,
-                'time_str': self._format_time(event_time),
-                'action': event['action'],
+                'action': event.action,
                 'icon': icon,
                 'description': description,
                 'track_index': next_index,
-                'details': event
+                'details': event._asdict()
             })
         
         return events
     
     def _get_event_icon(self, action: str) -> str:
         """Get icon for timeline event"""
-        icons = {
-            'start_deck_b': '▶️',
-            'eq_low_cut_deck_a_start': '🎛️',
-            'eq_low_introduce_deck_b': '🎛️',
-            'eq_high_introduce_deck_b': '🎛️',
-            'eq_mid_introduce_deck_b': '🎛️',
-            'crossfader_50_50': '🎚️',
-            'fade_out_deck_a': '🎚️',
-            'deck_b_only': '✅'
-        }
-        return icons.get(action, '•')
+        return self._ICONS.get(action, '•')
     
     def _get_track_name(self, track: Dict) -> str:
         """Get display name for track"""
@@ -193,14 +213,12 @@ class SetPlanner:
     
     def _format_time(self, seconds: float) -> str:
         """Format seconds as MM:SS"""
-        mins = int(seconds // 60)
-        secs = int(seconds % 60)
+        mins, secs = divmod(int(seconds), 60)
         return f"{mins:02d}:{secs:02d}"
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration as 'Xm Ys'"""
-        mins = int(seconds // 60)
-        secs = int(seconds % 60)
+        mins, secs = divmod(int(seconds), 60)
         return f"{mins}m {secs}s"
     
     def _get_energy_flow(self, energy_a: float, energy_b: float) -> str:
@@ -227,11 +245,13 @@ class SetPlanner:
         """
         suggestions = []
         
-        # Find current position in timeline
+        # Find current position in timeline (sorted by time)
         timeline = plan.get('timeline', [])
+        times = [e['time'] for e in timeline]
         
         # Find next 3 events
-        upcoming = [e for e in timeline if e['time'] > current_position][:3]
+        idx = bisect_right(times, current_position)
+        upcoming = timeline[idx:idx + 3]
         
         if not upcoming:
             suggestions.append("Set ending soon!")
@@ -245,10 +265,10 @@ class SetPlanner:
             suggestions.append(f"⏰ Coming up: {next_event['description']}")
         
         # Check for manual opportunities
-        if 'eq' in next_event['action']:
+        if next_event['action'] in _EQ_ACTIONS:
             suggestions.append("💡 Tip: You can adjust EQ manually for creative flair")
         
-        if 'crossfader' in next_event['action']:
+        if next_event['action'] in _XFADE_ACTIONS:
             suggestions.append("🎚️ Try moving the crossfader yourself for more control")
         
         # Show next events
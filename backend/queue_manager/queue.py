@@ -9,9 +9,170 @@ Handles:
 - Next track suggestions
 """
 
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+from typing import Deque, List, Dict, Tuple, Optional
 import json
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: run the function as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Below this many queued tracks, a scalar loop beats NumPy call overhead
+SCALAR_QUEUE_MAX = 20
+
+# Compatibility score weights and BPM ramp, shared by the scalar and array
+# scorers: BPM differences up to BPM_TOLERANCE score 1.0, then the BPM
+# score falls linearly to 0 over the next BPM_FALLOFF BPM
+BPM_WEIGHT = 0.4
+KEY_WEIGHT = 0.3
+ENERGY_WEIGHT = 0.3
+BPM_TOLERANCE = 6
+BPM_FALLOFF = 20
+
+
+@lru_cache(maxsize=None)
+def _camelot_index(camelot: str) -> int:
+    """
+    Pack a Camelot code into an index for CAMELOT_LUT
+    
+    '1A' -> 0, '1B' -> 1, ... '12B' -> 23. Anything unparseable
+    (empty, 'Unknown', ...) returns -1. Cached, so each distinct code
+    is only parsed once.
+    """
+    try:
+        num = int(camelot[:-1])
+    except (TypeError, ValueError):
+        return -1
+    letter = camelot[-1]
+    if not 1 <= num <= 12 or letter not in ('A', 'B'):
+        return -1
+    return (num - 1) * 2 + (1 if letter == 'B' else 0)
+
+
+def _build_camelot_lut_q() -> np.ndarray:
+    """
+    Build the quantized Camelot compatibility table
+    
+    Rules:
+    - Same key (e.g., 1A → 1A): Perfect (1.0)
+    - Relative major/minor (e.g., 1A → 1B): Perfect (1.0)
+    - Adjacent keys (e.g., 1A → 2A or 12A): Good (0.8)
+    - +1 hour (e.g., 1A → 2A): Good (0.8)
+    - -1 hour (e.g., 1A → 12A): Good (0.8)
+    - Everything else, or unknown key (-1): Mediocre (0.5)
+    
+    Entries are tiers into SCORE_TABLE: 0 = mediocre, 1 = adjacent key,
+    2 = same key or relative major/minor. The table is 25x25: row/column
+    24 stays at tier 0 for unknown keys, so an index of -1 wraps onto it.
+    """
+    num, letter = np.divmod(np.arange(24), 2)
+    hour = (num[None, :] - num[:, None]) % 12
+    same_letter = letter[:, None] == letter[None, :]
+    adjacent = same_letter & ((hour == 1) | (hour == 11))
+    
+    lut_q = np.zeros((25, 25), np.uint8)
+    lut_q[:24, :24] = 2 * (hour == 0) + adjacent
+    return lut_q
+
+
+CAMELOT_LUT_Q = _build_camelot_lut_q()
+SCORE_TABLE = np.array([0.5, 0.8, 1.0])
+
+# Decoded once so every lookup is a single index
+CAMELOT_LUT = SCORE_TABLE[CAMELOT_LUT_Q]
+
+
+# The on-disk cache is keyed by file, not module name: a cache written when
+# imported as part of the package can't be loaded when run as a script
+@njit(cache=__name__ != '__main__')
+def _score_pair(
+    bpm_a: float,
+    bpm_b: float,
+    cam_a: int,
+    cam_b: int,
+    energy_a: float,
+    energy_b: float,
+    lut: np.ndarray
+) -> float:
+    """Scalar compatibility score (JIT-compiled when Numba is available)"""
+    bpm_diff = abs(bpm_a - bpm_b)
+    if bpm_diff <= BPM_TOLERANCE:
+        bpm_score = 1.0
+    else:
+        bpm_score = max(0.0, 1 - (bpm_diff - BPM_TOLERANCE) / BPM_FALLOFF)
+    
+    energy_score = max(0.0, 1 - abs(energy_a - energy_b))
+    
+    return (
+        BPM_WEIGHT * bpm_score
+        + KEY_WEIGHT * lut[cam_a, cam_b]
+        + ENERGY_WEIGHT * energy_score
+    )
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) now, not on the first request
+    _score_pair(120.0, 120.0, 0, 0, 0.5, 0.5, CAMELOT_LUT)
+
+
+def _score_arrays(
+    bpm_a: np.ndarray,
+    bpm_b: np.ndarray,
+    energy_a: np.ndarray,
+    energy_b: np.ndarray,
+    cam_a: np.ndarray,
+    cam_b: np.ndarray
+) -> np.ndarray:
+    """
+    Elementwise version of QueueManager._score_compatibility
+    
+    Inputs broadcast against each other, so a single track can be scored
+    against a whole column or pairs can be scored in one go.
+    """
+    bpm_score = np.clip(1 - (np.abs(bpm_a - bpm_b) - BPM_TOLERANCE) / BPM_FALLOFF, 0, 1)
+    energy_score = np.clip(1 - np.abs(energy_a - energy_b), 0, 1)
+    key_score = CAMELOT_LUT[cam_a, cam_b]
+    return BPM_WEIGHT * bpm_score + KEY_WEIGHT * key_score + ENERGY_WEIGHT * energy_score
+
+
+def _top_indices(scores: np.ndarray, count: int) -> np.ndarray:
+    """
+    Indices of the `count` best scores, best first (ties keep index order)
+    
+    Uses a partial selection for the threshold and only sorts the
+    entries at or above it, so the cost is O(N) plus O(k log k) rather
+    than a full O(N log N) sort.
+    """
+    count = min(count, len(scores))
+    if count <= 0:
+        return np.empty(0, np.intp)
+    
+    if count == 1:
+        # Single best: argmax already returns the first of any ties
+        return np.array([np.argmax(scores)])
+    
+    if count == len(scores):
+        # Everything requested, nothing to partition
+        return np.argsort(-scores, kind='stable')
+    
+    kth = len(scores) - count
+    threshold = np.partition(scores, kth)[kth]
+    top = np.flatnonzero(scores >= threshold)
+    return top[np.lexsort((top, -scores[top]))][:count]
+
 
 class QueueManager:
     """Manages DJ queue with intelligent track suggestions"""
@@ -19,25 +180,62 @@ class QueueManager:
     def __init__(self):
         self.queue: List[Dict] = []
         self.current_track: Optional[Dict] = None
-        self.played_tracks: List[Dict] = []
+        self.played_tracks: Deque[Dict] = deque()
+        
+        # Bumped on every change that can alter get_next_track() results,
+        # so callers can cache suggestions against it
+        self.revision = 0
+        
+        # Scoring columns, index-aligned with self.queue. Preallocated and
+        # doubled when full; only the first self._size entries are valid.
+        self._size = 0
+        self._bpm = np.empty(16)
+        self._energy = np.empty(16)
+        self._cam_idx = np.empty(16, np.int8)
         
     def add_track(self, track_analysis: Dict) -> None:
         """Add track to queue"""
+        if self._size == len(self._bpm):
+            self._grow_columns()
+        
+        i = self._size
+        self._bpm[i] = track_analysis.get('bpm', 0.0)
+        self._energy[i] = track_analysis.get('energy', 0.5)
+        self._cam_idx[i] = _camelot_index(track_analysis.get('camelot', ''))
+        self._size += 1
+        
         self.queue.append(track_analysis)
+        self.revision += 1
         
     def remove_track(self, track_id: str) -> bool:
         """Remove track from queue by file path"""
         for i, track in enumerate(self.queue):
             if track.get('file_path') == track_id:
                 self.queue.pop(i)
+                
+                # Shift the tail down one slot to keep queue order
+                end = self._size
+                self._bpm[i:end - 1] = self._bpm[i + 1:end]
+                self._energy[i:end - 1] = self._energy[i + 1:end]
+                self._cam_idx[i:end - 1] = self._cam_idx[i + 1:end]
+                self._size -= 1
+                self.revision += 1
                 return True
         return False
+    
+    def _grow_columns(self) -> None:
+        """Double the capacity of the scoring columns"""
+        capacity = 2 * len(self._bpm)
+        self._bpm = np.resize(self._bpm, capacity)
+        self._energy = np.resize(self._energy, capacity)
+        self._cam_idx = np.resize(self._cam_idx, capacity)
         
     def set_current_track(self, track_analysis: Dict) -> None:
         """Set the currently playing track"""
         if self.current_track:
             self.played_tracks.append(self.current_track)
         self.current_track = track_analysis
+        self.revision += 1
         
     def get_next_track(self, count: int = 1) -> List[Tuple[Dict, float]]:
         """
@@ -56,16 +254,56 @@ class QueueManager:
             # No current track, just return first track(s)
             return [(track, 1.0) for track in self.queue[:count]]
         
-        # Score all tracks in queue
-        scored = []
-        for track in self.queue:
-            score = self._score_compatibility(self.current_track, track)
-            scored.append((track, score))
+        current = self.current_track
+        
+        if len(self.queue) <= SCALAR_QUEUE_MAX:
+            # Small queue: scalar kernel over the columns
+            cur_bpm = float(current['bpm'])
+            cur_energy = float(current.get('energy', 0.5))
+            cur_cam = _camelot_index(current.get('camelot', ''))
+            n = self._size
+            columns = zip(self._bpm[:n].tolist(), self._cam_idx[:n].tolist(), self._energy[:n].tolist())
+            
+            scored = []
+            for track, (bpm, cam, energy) in zip(self.queue, columns):
+                score = _score_pair(cur_bpm, bpm, cur_cam, cam, cur_energy, energy, CAMELOT_LUT)
+                scored.append((track, float(score)))
+            
+            scored.sort(key=itemgetter(1), reverse=True)
+            return scored[:count]
+        
+        n = self._size
+        cur_bpm = current['bpm']
+        cur_energy = current.get('energy', 0.5)
+        cur_cam = _camelot_index(current.get('camelot', ''))
         
-        # Sort by score (best first)
-        scored.sort(key=lambda x: x[1], reverse=True)
+        count = min(count, n)
+        if count <= 0:
+            return []
+        
+        # Tracks 26+ BPM away get no BPM credit, so they can score at most
+        # 0.6. Score the tracks inside that window first; if the best `count`
+        # of them all beat 0.6, the rest of the queue can't make the cut.
+        near = np.flatnonzero(np.abs(self._bpm[:n] - cur_bpm) < 26)
+        if len(near) >= count:
+            near_total = _score_arrays(
+                cur_bpm, self._bpm[near],
+                cur_energy, self._energy[near],
+                cur_cam, self._cam_idx[near]
+            )
+            top = _top_indices(near_total, count)
+            if near_total[top[-1]] > 0.6:
+                return [(self.queue[near[i]], float(near_total[i])) for i in top]
         
-        return scored[:count]
+        # Score all tracks in queue at once
+        total = _score_arrays(
+            cur_bpm, self._bpm[:n],
+            cur_energy, self._energy[:n],
+            cur_cam, self._cam_idx[:n]
+        )
+        top = _top_indices(total, count)
+        
+        return [(self.queue[i], float(total[i])) for i in top]
     
     def _score_compatibility(self, track_a: Dict, track_b: Dict) -> float:
         """
@@ -79,112 +317,62 @@ class QueueManager:
         Returns:
             Score from 0.0 (incompatible) to 1.0 (perfect match)
         """
-        # BPM compatibility (40% weight)
-        bpm_diff = abs(track_a['bpm'] - track_b['bpm'])
-        if bpm_diff <= 6:
-            bpm_score = 1.0
-        else:
-            bpm_score = max(0, 1 - (bpm_diff - 6) / 20)
-        
-        # Key compatibility (30% weight)
-        key_score = self._camelot_compatibility(
-            track_a.get('camelot', ''), 
-            track_b.get('camelot', '')
-        )
-        
-        # Energy compatibility (30% weight)
-        energy_a = track_a.get('energy', 0.5)
-        energy_b = track_b.get('energy', 0.5)
-        energy_diff = abs(energy_a - energy_b)
-        energy_score = max(0, 1 - energy_diff)
-        
-        # Weighted average
-        total_score = (
-            0.4 * bpm_score +
-            0.3 * key_score +
-            0.3 * energy_score
-        )
-        
-        return total_score
+        # Weights and BPM ramp: the module-level constants shared with _score_arrays
+        return float(_score_pair(
+            float(track_a['bpm']),
+            float(track_b['bpm']),
+            _camelot_index(track_a.get('camelot', '')),
+            _camelot_index(track_b.get('camelot', '')),
+            float(track_a.get('energy', 0.5)),
+            float(track_b.get('energy', 0.5)),
+            CAMELOT_LUT
+        ))
     
-    def _camelot_compatibility(self, camelot_a: str, camelot_b: str) -> float:
-        """
-        Check Camelot wheel compatibility
-        
-        Rules:
-        - Same key (e.g., 1A → 1A): Perfect (1.0)
-        - Relative major/minor (e.g., 1A → 1B): Perfect (1.0)
-        - Adjacent keys (e.g., 1A → 2A or 12A): Good (0.8)
-        - +1 hour (e.g., 1A → 2A): Good (0.8)
-        - -1 hour (e.g., 1A → 12A): Good (0.8)
-        - Everything else: Mediocre (0.5)
-        
-        Returns:
-            Compatibility score from 0.5 to 1.0
-        """
-        if not camelot_a or not camelot_b:
-            return 0.5
-            
-        if camelot_a == camelot_b:
-            return 1.0  # Same key = perfect
-        
-        try:
-            # Extract number and letter
-            num_a = int(camelot_a[:-1])
-            letter_a = camelot_a[-1]
-            num_b = int(camelot_b[:-1])
-            letter_b = camelot_b[-1]
-            
-            # Relative major/minor (same number, different letter)
-            if num_a == num_b and letter_a != letter_b:
-                return 1.0
-            
-            # Adjacent keys (±1 hour, same letter)
-            if letter_a == letter_b:
-                diff = (num_b - num_a) % 12
-                if diff == 1 or diff == 11:  # +1 or -1 (wrapping at 12)
-                    return 0.8
-            
-            # Not compatible, but not terrible
-            return 0.5
-            
-        except (ValueError, IndexError):
-            return 0.5
-    
-    def get_compatibility_matrix(self) -> List[Dict]:
+    def get_compatibility_matrix(self, top_k: Optional[int] = None) -> List[Dict]:
         """
         Get compatibility scores for all pairs of tracks in queue
         
+        Args:
+            top_k: Only return the best `top_k` pairs (default: all pairs)
+        
         Returns:
-            List of compatibility entries with track pairs and scores
+            List of compatibility entries with track pairs and scores,
+            sorted by score (best first)
         """
         if not self.queue or len(self.queue) < 2:
             return []
         
-        matrix = []
-        for i, track_a in enumerate(self.queue):
-            for j, track_b in enumerate(self.queue):
-                if i >= j:
-                    continue
-                
-                score = self._score_compatibility(track_a, track_b)
-                
-                matrix.append({
-                    'track_a': track_a.get('file_path', 'Unknown'),
-                    'track_b': track_b.get('file_path', 'Unknown'),
-                    'bpm_a': track_a.get('bpm', 0),
-                    'bpm_b': track_b.get('bpm', 0),
-                    'bpm_diff': abs(track_a.get('bpm', 0) - track_b.get('bpm', 0)),
-                    'key_a': f"{track_a.get('key', '?')} {track_a.get('scale', '?')}",
-                    'key_b': f"{track_b.get('key', '?')} {track_b.get('scale', '?')}",
-                    'camelot_a': track_a.get('camelot', ''),
-                    'camelot_b': track_b.get('camelot', ''),
-                    'score': score,
-                    'rating': self._score_to_rating(score)
-                })
+        # Score every (i < j) pair in one pass over the columns
+        rows, cols = np.triu_indices(len(self.queue), 1)
+        scores = _score_arrays(
+            self._bpm[rows], self._bpm[cols],
+            self._energy[rows], self._energy[cols],
+            self._cam_idx[rows], self._cam_idx[cols]
+        )
+        bpm_diff = np.abs(self._bpm[rows] - self._bpm[cols])
+        
+        count = len(scores) if top_k is None else top_k
         
-        # Sort by score (best first)
-        matrix.sort(key=lambda x: x['score'], reverse=True)
+        # Only the selected pairs get turned into dicts
+        matrix = []
+        for p in _top_indices(scores, count):
+            track_a = self.queue[rows[p]]
+            track_b = self.queue[cols[p]]
+            score = float(scores[p])
+            
+            matrix.append({
+                'track_a': track_a.get('file_path', 'Unknown'),
+                'track_b': track_b.get('file_path', 'Unknown'),
+                'bpm_a': track_a.get('bpm', 0),
+                'bpm_b': track_b.get('bpm', 0),
+                'bpm_diff': float(bpm_diff[p]),
+                'key_a': f"{track_a.get('key', '?')} {track_a.get('scale', '?')}",
+                'key_b': f"{track_b.get('key', '?')} {track_b.get('scale', '?')}",
+                'camelot_a': track_a.get('camelot', ''),
+                'camelot_b': track_b.get('camelot', ''),
+                'score': score,
+                'rating': self._score_to_rating(score)
+            })
         
         return matrix
     
@@ -9,13 +9,181 @@ Handles:
 - Transition strategies (quick mix, long blend, etc.)
 """
 
-from typing import Dict, List, Optional
-import json
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: run the function as plain Python"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# What each automation action does
+_EVENT_DESCRIPTIONS = {
+    'start_deck_b': 'Start playing track B (silent)',
+    'eq_low_cut_deck_a_start': 'Start cutting lows on track A',
+    'eq_low_introduce_deck_b': 'Introduce lows on track B',
+    'eq_high_introduce_deck_b': 'Introduce highs on track B',
+    'eq_mid_introduce_deck_b': 'Introduce mids on track B',
+    'crossfader_50_50': 'Crossfader at 50/50',
+    'fade_out_deck_a': 'Fade out track A',
+    'deck_b_only': 'Track B only playing',
+}
+
+# (beat, action) automation events per transition length in bars
+_TIMELINE_BEATS = {
+    # Quick mix
+    8: (
+        (0, 'start_deck_b'),
+        (4, 'eq_low_cut_deck_a_start'),
+        (8, 'eq_low_introduce_deck_b'),
+        (16, 'crossfader_50_50'),
+        (24, 'fade_out_deck_a'),
+        (32, 'deck_b_only'),
+    ),
+    # Standard mix
+    16: (
+        (0, 'start_deck_b'),
+        (8, 'eq_low_cut_deck_a_start'),
+        (12, 'eq_low_introduce_deck_b'),
+        (32, 'crossfader_50_50'),
+        (48, 'fade_out_deck_a'),
+        (64, 'deck_b_only'),
+    ),
+    # Long mix
+    32: (
+        (0, 'start_deck_b'),
+        (16, 'eq_high_introduce_deck_b'),
+        (32, 'eq_mid_introduce_deck_b'),
+        (48, 'eq_low_cut_deck_a_start'),
+        (64, 'eq_low_introduce_deck_b'),
+        (80, 'crossfader_50_50'),
+        (96, 'fade_out_deck_a'),
+        (128, 'deck_b_only'),
+    ),
+}
+
+# (beat, action, description) templates, built once at import
+_TIMELINE_TEMPLATES = {
+    bars: tuple((beat, action, _EVENT_DESCRIPTIONS[action]) for beat, action in events)
+    for bars, events in _TIMELINE_BEATS.items()
+}
+
+# One automation event of a transition timeline (time in seconds from the
+# transition start). Use TransitionPlanner.plan_to_dict before serializing.
+TimelineEvent = namedtuple('TimelineEvent', 'beat time action description')
+
+
+@lru_cache(maxsize=1024)
+def _bar_length(bpm: float) -> float:
+    """Length of one 4/4 bar in seconds, cached per BPM"""
+    return 240.0 / bpm
+
+
+# Labels for the codes returned by _classify_mix
+_SPEED_LABELS = ('smooth', 'moderate', 'quick')
+_EQ_STRATEGIES = (
+    ('gradual_energy_increase', 'Gradually introduce high-end first, then mids, then bass'),
+    ('energy_decrease', 'Quick bass swap, fade highs slowly'),
+    ('balanced', 'Standard EQ swap (lows first, then highs)'),
+)
+_CONFIDENCE_LABELS = ('high', 'medium', 'low')
+
+# Mix classification thresholds, shared by the per-pair and queue paths:
+# largest BPM / energy difference for a smooth, high-confidence mix and for
+# a moderate, medium-confidence one
+_SMOOTH_BPM_DIFF = 3
+_MODERATE_BPM_DIFF = 6
+_HIGH_CONFIDENCE_ENERGY_DIFF = 0.15
+_MEDIUM_CONFIDENCE_ENERGY_DIFF = 0.3
+
+
+def _classify_mix(bpm_a: float, bpm_b: float, energy_a: float, energy_b: float):
+    """
+    Numeric core of TransitionPlanner._determine_mix_strategy
+    
+    Plain Python for single pairs, where Numba's dispatch would cost more
+    than it saves; _classify_mixes runs a compiled copy over whole queues.
+    
+    Returns:
+        (speed_code, recommended_bars, eq_code, confidence_code), with
+        codes indexing _SPEED_LABELS, _EQ_STRATEGIES and _CONFIDENCE_LABELS
+    """
+    bpm_diff = abs(bpm_a - bpm_b)
+    energy_diff = abs(energy_a - energy_b)
+    
+    # Transition type
+    if bpm_diff <= _SMOOTH_BPM_DIFF:
+        speed, bars = 0, 16
+    elif bpm_diff <= _MODERATE_BPM_DIFF:
+        speed, bars = 1, 12
+    else:
+        speed, bars = 2, 8
+    
+    # EQ strategy
+    if energy_b > energy_a:
+        eq = 0
+    elif energy_b < energy_a:
+        eq = 1
+    else:
+        eq = 2
+    
+    # Confidence level
+    if bpm_diff <= _SMOOTH_BPM_DIFF and energy_diff <= _HIGH_CONFIDENCE_ENERGY_DIFF:
+        confidence = 0
+    elif bpm_diff <= _MODERATE_BPM_DIFF and energy_diff <= _MEDIUM_CONFIDENCE_ENERGY_DIFF:
+        confidence = 1
+    else:
+        confidence = 2
+    
+    return speed, bars, eq, confidence
+
+
+# Cached only when imported: see the note on queue._score_pair
+_classify_mix_compiled = njit(cache=__name__ != '__main__')(_classify_mix)
+
+
+# Cached only when imported: see the note on queue._score_pair
+@njit(cache=__name__ != '__main__')
+def _classify_mixes(bpm_a: np.ndarray, bpm_b: np.ndarray, energy_a: np.ndarray, energy_b: np.ndarray):
+    """
+    _classify_mix over arrays of transitions
+    
+    Returns:
+        (speed_codes, recommended_bars, eq_codes, confidence_codes) arrays
+    """
+    n = bpm_a.shape[0]
+    speeds = np.empty(n, dtype=np.int64)
+    bars = np.empty(n, dtype=np.int64)
+    eqs = np.empty(n, dtype=np.int64)
+    confidences = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        speeds[i], bars[i], eqs[i], confidences[i] = _classify_mix_compiled(
+            bpm_a[i], bpm_b[i], energy_a[i], energy_b[i]
+        )
+    return speeds, bars, eqs, confidences
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) at import
+    _classify_mixes(np.full(1, 128.0), np.full(1, 128.0), np.full(1, 0.5), np.full(1, 0.5))
 
 
 class TransitionPlanner:
     """Plans transitions between DJ tracks"""
     
+    __slots__ = ('default_transition_bars',)
+    
     def __init__(self):
         self.default_transition_bars = 16  # Standard DJ transition length
         
@@ -37,12 +205,7 @@ class TransitionPlanner:
             Transition plan with cue points and timeline
         """
         # Get transition length based on type
-        if transition_type == 'quick':
-            transition_bars = 8
-        elif transition_type == 'long':
-            transition_bars = 32
-        else:
-            transition_bars = self.default_transition_bars
+        transition_bars = self._transition_bars(transition_type)
         
         # Calculate bar length from BPM
         track_a_bpm = track_a['bpm']
@@ -57,9 +220,7 @@ class TransitionPlanner:
         # Find cue point in track B
         # Usually: start at intro (first 16-32 beats)
         track_b_cue = self._find_cue_point(track_b)
-        
-        # Calculate transition duration
-        transition_duration = transition_bars * bar_length
+        bar_length_b = self._calculate_bar_length(track_b['bpm'])
         
         # Generate automation timeline
         timeline = self._generate_timeline(
@@ -72,21 +233,131 @@ class TransitionPlanner:
         # Calculate mix strategy based on track compatibility
         mix_strategy = self._determine_mix_strategy(track_a, track_b)
         
+        return self._assemble_plan(
+            track_a,
+            track_b,
+            transition_type=transition_type,
+            transition_bars=transition_bars,
+            bar_length=bar_length,
+            transition_start=transition_start,
+            cue_point=track_b_cue,
+            cue_point_bars=int(track_b_cue / bar_length_b),
+            mix_strategy=mix_strategy,
+            timeline=timeline
+        )
+    
+    def plan_queue(self, tracks: List[Dict], transition_type: str = 'standard') -> List[Dict]:
+        """
+        Plan every transition of a queue at once
+        
+        Gives the same plans as calling plan_transition on each adjacent
+        pair, but the per-pair arithmetic runs as array operations and
+        only the final dict assembly loops in Python.
+        
+        Args:
+            tracks: Track analyses in play order
+            transition_type: 'quick' (8 bars), 'standard' (16 bars), 'long' (32 bars)
+            
+        Returns:
+            One transition plan per adjacent pair of tracks
+        """
+        if len(tracks) < 2:
+            return []
+        
+        transition_bars = self._transition_bars(transition_type)
+        
+        bpms = np.array([t['bpm'] for t in tracks], dtype=float)
+        durations = np.array([t['duration'] for t in tracks[:-1]], dtype=float)
+        energies = np.array([t.get('energy', 0.5) for t in tracks], dtype=float)
+        cue_points = np.array([self._find_cue_point(t) for t in tracks[1:]], dtype=float)
+        
+        bar_lengths = 240.0 / bpms
+        bar_a = bar_lengths[:-1]
+        bar_b = bar_lengths[1:]
+        energy_a = energies[:-1]
+        energy_b = energies[1:]
+        
+        # Transition start N bars before the end of A, cue point in B
+        transition_starts = np.maximum(0, durations - transition_bars * bar_a)
+        cue_point_bars = (cue_points / bar_b).astype(int)
+        
+        # Mix strategy codes
+        bpm_diffs = np.abs(np.diff(bpms))
+        energy_diffs = np.abs(energy_a - energy_b)
+        speeds, recommended_bars, eqs, confidences = _classify_mixes(
+            bpms[:-1], bpms[1:], energy_a, energy_b
+        )
+        
+        columns = zip(
+            bar_a.tolist(), transition_starts.tolist(),
+            cue_points.tolist(), cue_point_bars.tolist(),
+            bpm_diffs.tolist(), energy_diffs.tolist(),
+            speeds.tolist(), recommended_bars.tolist(), eqs.tolist(), confidences.tolist()
+        )
+        
+        plans = []
+        for i, (bar_length, start, cue, cue_bars,
+                bpm_diff, energy_diff, speed, bars, eq, confidence) in enumerate(columns):
+            track_a = tracks[i]
+            track_b = tracks[i + 1]
+            
+            plans.append(self._assemble_plan(
+                track_a,
+                track_b,
+                transition_type=transition_type,
+                transition_bars=transition_bars,
+                bar_length=bar_length,
+                transition_start=start,
+                cue_point=cue,
+                cue_point_bars=cue_bars,
+                mix_strategy=self._strategy_dict(
+                    bpm_diff, energy_diff, speed, bars, eq, confidence
+                ),
+                timeline=self._generate_timeline(
+                    transition_bars, bar_length, track_a['bpm'], track_b['bpm']
+                )
+            ))
+        
+        return plans
+    
+    def _transition_bars(self, transition_type: str) -> int:
+        """Transition length in bars for a transition type"""
+        if transition_type == 'quick':
+            return 8
+        elif transition_type == 'long':
+            return 32
+        else:
+            return self.default_transition_bars
+    
+    def _assemble_plan(
+        self,
+        track_a: Dict,
+        track_b: Dict,
+        transition_type: str,
+        transition_bars: int,
+        bar_length: float,
+        transition_start: float,
+        cue_point: float,
+        cue_point_bars: int,
+        mix_strategy: Dict,
+        timeline: List[TimelineEvent]
+    ) -> Dict:
+        """Build the transition plan dict returned by plan_transition/plan_queue"""
         return {
             'track_a': {
                 'file_path': track_a.get('file_path'),
                 'transition_start': transition_start,
                 'transition_start_bars': int(transition_start / bar_length),
-                'bpm': track_a_bpm
+                'bpm': track_a['bpm']
             },
             'track_b': {
                 'file_path': track_b.get('file_path'),
-                'cue_point': track_b_cue,
-                'cue_point_bars': int(track_b_cue / self._calculate_bar_length(track_b['bpm'])),
+                'cue_point': cue_point,
+                'cue_point_bars': cue_point_bars,
                 'bpm': track_b['bpm']
             },
             'transition': {
-                'duration': transition_duration,
+                'duration': transition_bars * bar_length,
                 'duration_bars': transition_bars,
                 'type': transition_type,
                 'strategy': mix_strategy,
@@ -95,6 +366,20 @@ class TransitionPlanner:
             'timeline': timeline
         }
     
+    def plan_to_dict(self, plan: Dict) -> Dict:
+        """
+        Copy of a transition plan with its timeline events as dicts
+        
+        Use this at API boundaries: JSON encoders turn the TimelineEvent
+        tuples into plain arrays and lose the field names.
+        """
+        if not plan or 'timeline' not in plan:
+            return plan
+        return {
+            **plan,
+            'timeline': [event._asdict() for event in plan['timeline']]
+        }
+    
     def _calculate_bar_length(self, bpm: float) -> float:
         """
         Calculate length of one bar in seconds
@@ -105,9 +390,7 @@ class TransitionPlanner:
         Returns:
             Bar length in seconds (assuming 4/4 time signature)
         """
-        beat_length = 60.0 / bpm  # Seconds per beat
-        bar_length = beat_length * 4  # 4 beats per bar
-        return bar_length
+        return _bar_length(bpm)
     
     def _find_cue_point(self, track: Dict) -> float:
         """
@@ -138,10 +421,9 @@ class TransitionPlanner:
         
         # Fallback: estimate based on BPM
         bpm = track.get('bpm', 120)
-        beat_length = 60.0 / bpm
         
         # Start at 16 beats (4 bars)
-        return 16 * beat_length
+        return 4 * _bar_length(bpm)
     
     def _generate_timeline(
         self, 
@@ -149,7 +431,7 @@ class TransitionPlanner:
         bar_length: float,
         bpm_a: float,
         bpm_b: float
-    ) -> List[Dict]:
+    ) -> List[TimelineEvent]:
         """
         Generate automation timeline for transition
         
@@ -164,144 +446,15 @@ class TransitionPlanner:
         Returns:
             List of automation events
         """
-        timeline = []
-        beats_per_bar = 4
-        total_beats = bars * beats_per_bar
-        
-        # Different strategies for different transition lengths
-        if bars == 8:  # Quick mix
-            timeline = [
-                {
-                    'beat': 0,
-                    'time': 0.0,
-                    'action': 'start_deck_b',
-                    'description': 'Start playing track B (silent)'
-                },
-                {
-                    'beat': 4,
-                    'time': 4 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_cut_deck_a_start',
-                    'description': 'Start cutting lows on track A'
-                },
-                {
-                    'beat': 8,
-                    'time': 8 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_introduce_deck_b',
-                    'description': 'Introduce lows on track B'
-                },
-                {
-                    'beat': 16,
-                    'time': 16 * (bar_length / beats_per_bar),
-                    'action': 'crossfader_50_50',
-                    'description': 'Crossfader at 50/50'
-                },
-                {
-                    'beat': 24,
-                    'time': 24 * (bar_length / beats_per_bar),
-                    'action': 'fade_out_deck_a',
-                    'description': 'Fade out track A'
-                },
-                {
-                    'beat': 32,
-                    'time': 32 * (bar_length / beats_per_bar),
-                    'action': 'deck_b_only',
-                    'description': 'Track B only playing'
-                }
-            ]
-        
-        elif bars == 16:  # Standard mix
-            timeline = [
-                {
-                    'beat': 0,
-                    'time': 0.0,
-                    'action': 'start_deck_b',
-                    'description': 'Start playing track B (silent)'
-                },
-                {
-                    'beat': 8,
-                    'time': 8 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_cut_deck_a_start',
-                    'description': 'Start cutting lows on track A'
-                },
-                {
-                    'beat': 12,
-                    'time': 12 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_introduce_deck_b',
-                    'description': 'Introduce lows on track B'
-                },
-                {
-                    'beat': 32,
-                    'time': 32 * (bar_length / beats_per_bar),
-                    'action': 'crossfader_50_50',
-                    'description': 'Crossfader at 50/50'
-                },
-                {
-                    'beat': 48,
-                    'time': 48 * (bar_length / beats_per_bar),
-                    'action': 'fade_out_deck_a',
-                    'description': 'Fade out track A'
-                },
-                {
-                    'beat': 64,
-                    'time': 64 * (bar_length / beats_per_bar),
-                    'action': 'deck_b_only',
-                    'description': 'Track B only playing'
-                }
-            ]
-        
-        else:  # Long mix (32 bars)
-            timeline = [
-                {
-                    'beat': 0,
-                    'time': 0.0,
-                    'action': 'start_deck_b',
-                    'description': 'Start playing track B (silent)'
-                },
-                {
-                    'beat': 16,
-                    'time': 16 * (bar_length / beats_per_bar),
-                    'action': 'eq_high_introduce_deck_b',
-                    'description': 'Introduce highs on track B'
-                },
-                {
-                    'beat': 32,
-                    'time': 32 * (bar_length / beats_per_bar),
-                    'action': 'eq_mid_introduce_deck_b',
-                    'description': 'Introduce mids on track B'
-                },
-                {
-                    'beat': 48,
-                    'time': 48 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_cut_deck_a_start',
-                    'description': 'Start cutting lows on track A'
-                },
-                {
-                    'beat': 64,
-                    'time': 64 * (bar_length / beats_per_bar),
-                    'action': 'eq_low_introduce_deck_b',
-                    'description': 'Introduce lows on track B'
-                },
-                {
-                    'beat': 80,
-                    'time': 80 * (bar_length / beats_per_bar),
-                    'action': 'crossfader_50_50',
-                    'description': 'Crossfader at 50/50'
-                },
-                {
-                    'beat': 96,
-                    'time': 96 * (bar_length / beats_per_bar),
-                    'action': 'fade_out_deck_a',
-                    'description': 'Fade out track A'
-                },
-                {
-                    'beat': 128,
-                    'time': 128 * (bar_length / beats_per_bar),
-                    'action': 'deck_b_only',
-                    'description': 'Track B only playing'
-                }
-            ]
+        # Quick (8) and standard (16) have their own templates; anything
+        # else gets the long mix
+        template = _TIMELINE_TEMPLATES.get(bars, _TIMELINE_TEMPLATES[32])
+        beat_len = bar_length * 0.25  # 4 beats per bar
         
-        return timeline
+        return [
+            TimelineEvent(beat, beat * beat_len, action, description)
+            for beat, action, description in template
+        ]
     
     def _determine_mix_strategy(self, track_a: Dict, track_b: Dict) -> Dict:
         """
@@ -314,68 +467,49 @@ class TransitionPlanner:
         Returns:
             Mix strategy with recommendations
         """
-        bpm_diff = abs(track_a['bpm'] - track_b['bpm'])
+        bpm_a = track_a['bpm']
+        bpm_b = track_b['bpm']
         energy_a = track_a.get('energy', 0.5)
         energy_b = track_b.get('energy', 0.5)
+        bpm_diff = abs(bpm_a - bpm_b)
         energy_diff = abs(energy_a - energy_b)
         
-        # Determine transition type
-        if bpm_diff <= 3:
-            transition_speed = 'smooth'
-            recommended_bars = 16
-        elif bpm_diff <= 6:
-            transition_speed = 'moderate'
-            recommended_bars = 12
-        else:
-            transition_speed = 'quick'
-            recommended_bars = 8
-        
-        # Determine EQ strategy
-        if energy_b > energy_a:
-            eq_strategy = 'gradual_energy_increase'
-            eq_notes = 'Gradually introduce high-end first, then mids, then bass'
-        elif energy_b < energy_a:
-            eq_strategy = 'energy_decrease'
-            eq_notes = 'Quick bass swap, fade highs slowly'
-        else:
-            eq_strategy = 'balanced'
-            eq_notes = 'Standard EQ swap (lows first, then highs)'
+        speed, recommended_bars, eq, confidence = _classify_mix(
+            bpm_a, bpm_b, energy_a, energy_b
+        )
+        return self._strategy_dict(
+            bpm_diff, energy_diff, speed, recommended_bars, eq, confidence
+        )
+    
+    def _strategy_dict(
+        self,
+        bpm_diff: float,
+        energy_diff: float,
+        speed: int,
+        recommended_bars: int,
+        eq: int,
+        confidence: int
+    ) -> Dict:
+        """Turn mix classification codes into the strategy dict"""
+        eq_strategy, eq_notes = _EQ_STRATEGIES[eq]
         
         # Effects recommendations
         effects = []
-        if bpm_diff > 3:
+        if bpm_diff > _SMOOTH_BPM_DIFF:
             effects.append('tempo_sync')
         if energy_diff > 0.2:
             effects.append('reverb_wash')
         
         return {
-            'transition_speed': transition_speed,
+            'transition_speed': _SPEED_LABELS[speed],
             'recommended_bars': recommended_bars,
             'bpm_difference': round(bpm_diff, 1),
             'energy_difference': round(energy_diff, 2),
             'eq_strategy': eq_strategy,
             'eq_notes': eq_notes,
             'recommended_effects': effects,
-            'confidence': self._calculate_confidence(bpm_diff, energy_diff)
+            'confidence': _CONFIDENCE_LABELS[confidence]
         }
-    
-    def _calculate_confidence(self, bpm_diff: float, energy_diff: float) -> str:
-        """
-        Calculate confidence level for transition
-        
-        Args:
-            bpm_diff: BPM difference between tracks
-            energy_diff: Energy difference between tracks
-            
-        Returns:
-            Confidence level: 'high', 'medium', or 'low'
-        """
-        if bpm_diff <= 3 and energy_diff <= 0.15:
-            return 'high'
-        elif bpm_diff <= 6 and energy_diff <= 0.3:
-            return 'medium'
-        else:
-            return 'low'
 
 
 if __name__ == "__main__":
@@ -423,7 +557,7 @@ if __name__ == "__main__":
     print(f"Mix Strategy:")
     strategy = plan['timeline']
     for event in strategy:
-        print(f"  Beat {event['beat']:3d} ({event['time']:5.1f}s): {event['description']}")
+        print(f"  Beat {event.beat:3d} ({event.time:5.1f}s): {event.description}")
     
     print()
     print("✓ Transition Planner working!")
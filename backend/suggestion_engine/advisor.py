@@ -11,13 +11,44 @@ Provides context-aware suggestions during a DJ set:
 """
 
 import time
-from typing import Dict, List, Optional
-from datetime import datetime
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    # Annotation only: keeps this file runnable as a script
+    from backend.queue_manager.transition_planner import TimelineEvent
 
 
 class DJAdvisor:
     """Real-time suggestion engine for DJ sets"""
     
+    __slots__ = (
+        'mixer', 'queue', 'planner',
+        'current_plan', '_timeline_times',
+        'transition_started', 'transition_start_time', 'last_suggestion_time',
+        '_last_status_key', '_last_suggestion',
+        '_next_track', '_next_track_revision',
+        '_inv_duration', '_inv_bar',
+        'transition_warning_time', 'transition_ready_time'
+    )
+    
+    # Polls closer together than this reuse the previous suggestion as long
+    # as the mixer state has not changed
+    SUGGESTION_INTERVAL = 0.05
+    
+    # Timeline action -> (message, suggested controls). The controls dicts
+    # are shared between calls and must not be mutated.
+    _EVENT_MESSAGES = {
+        'start_deck_b': ('▶️ START DECK B', {'deck': 'B', 'play': True}),
+        'eq_low_cut_deck_a_start': ('🎛️ CUT BASS Deck A', {'deck': 'A', 'eq_bass': 0.2}),
+        'eq_low_introduce_deck_b': ('🎛️ BRING BASS Deck B', {'deck': 'B', 'eq_bass': 1.0}),
+        'eq_high_introduce_deck_b': ('🎛️ HIGHS IN Deck B', {'deck': 'B', 'eq_high': 1.0}),
+        'eq_mid_introduce_deck_b': ('🎛️ MIDS IN Deck B', {'deck': 'B', 'eq_mid': 1.0}),
+        'crossfader_50_50': ('🎚️ CROSSFADER CENTER', {'crossfader': 0.0}),
+        'fade_out_deck_a': ('🎚️ FADE OUT Deck A', {'deck': 'A', 'fade_out': True}),
+        'deck_b_only': ('✅ DECK B ONLY - Transition complete!', {})
+    }
+    
     def __init__(self, mixer, queue_manager, transition_planner):
         self.mixer = mixer
         self.queue = queue_manager
@@ -25,9 +56,16 @@ class DJAdvisor:
         
         # State
         self.current_plan: Optional[Dict] = None
+        self._timeline_times: List[float] = []
+        self._inv_duration = 0.0
+        self._inv_bar = 0.0
         self.transition_started = False
         self.transition_start_time = None
-        self.last_suggestion_time = 0
+        self.last_suggestion_time = 0.0
+        self._last_status_key = None
+        self._last_suggestion: Optional[Dict] = None
+        self._next_track: Optional[Dict] = None
+        self._next_track_revision = -1
         
         # Thresholds
         self.transition_warning_time = 32  # Start warning 32s before transition
@@ -36,8 +74,15 @@ class DJAdvisor:
     def update_transition_plan(self, track_a: Dict, track_b: Dict):
         """Update the transition plan for current tracks"""
         self.current_plan = self.planner.plan_transition(track_a, track_b)
+        self._timeline_times = [event.time for event in self.current_plan['timeline']]
+        
+        # Reciprocals for the per-poll progress and bar countdowns
+        transition = self.current_plan['transition']
+        self._inv_duration = 1.0 / transition['duration']
+        self._inv_bar = 1.0 / transition['bar_length']
         self.transition_started = False
         self.transition_start_time = None
+        self._last_suggestion = None
         
     def get_suggestion(self) -> Dict:
         """
@@ -51,13 +96,34 @@ class DJAdvisor:
         - controls: Suggested control values
         - timing: When this should happen
         """
-        now = time.time()
+        now = time.monotonic()
         
         # Get mixer status
         status = self.mixer.get_status()
         deck_a = status['deck_a']
         deck_b = status['deck_b']
         
+        # Rapid polls with an unchanged mixer state get the cached suggestion
+        status_key = (
+            deck_a['playing'],
+            deck_b['playing'],
+            int(deck_a['position'] * 10),
+            deck_b['loaded']
+        )
+        if (self._last_suggestion is not None
+                and now - self.last_suggestion_time < self.SUGGESTION_INTERVAL
+                and status_key == self._last_status_key):
+            return self._last_suggestion
+        
+        suggestion = self._build_suggestion(deck_a, deck_b)
+        self.last_suggestion_time = now
+        self._last_status_key = status_key
+        self._last_suggestion = suggestion
+        return suggestion
+    
+    def _build_suggestion(self, deck_a: Dict, deck_b: Dict) -> Dict:
+        """Compute a fresh suggestion for the given deck states"""
+        
         # No track playing
         if not deck_a['playing'] and not deck_b['playing']:
             return {
@@ -94,7 +160,7 @@ class DJAdvisor:
                         'urgency': 'high',
                         'color': 'red',
                         'controls': {
-                            'next_track': self.queue.get_next_track()[0][0] if self.queue.queue else None
+                            'next_track': self._get_next_track()
                         },
                         'timing': 'now'
                     }
@@ -130,6 +196,14 @@ class DJAdvisor:
             'timing': None
         }
     
+    def _get_next_track(self) -> Optional[Dict]:
+        """Best next track from the queue, recomputed only when the queue changes"""
+        revision = self.queue.revision
+        if revision != self._next_track_revision:
+            self._next_track = self.queue.get_next_track()[0][0] if self.queue.queue else None
+            self._next_track_revision = revision
+        return self._next_track
+    
     def _get_transition_suggestion(self, deck_a: Dict, deck_b: Dict) -> Dict:
         """Get suggestion during transition phase"""
         
@@ -139,20 +213,22 @@ class DJAdvisor:
         
         # Far from transition - just monitor
         if time_until_transition > self.transition_warning_time:
+            seconds_until = int(time_until_transition)
             return {
-                'message': f'🎵 Cruising - transition in {int(time_until_transition)}s',
+                'message': f'🎵 Cruising - transition in {seconds_until}s',
                 'action': 'playing',
                 'urgency': 'low',
                 'color': 'green',
                 'controls': {},
-                'timing': f'{int(time_until_transition)}s'
+                'timing': f'{seconds_until}s'
             }
         
         # Warning phase - prepare for transition
         elif time_until_transition > self.transition_ready_time:
+            seconds_until = int(time_until_transition)
             if not deck_b['loaded']:
                 return {
-                    'message': f'⚠️ Load Deck B NOW - {int(time_until_transition)}s until transition!',
+                    'message': f'⚠️ Load Deck B NOW - {seconds_until}s until transition!',
                     'action': 'load_deck_b',
                     'urgency': 'high',
                     'color': 'red',
@@ -162,21 +238,23 @@ class DJAdvisor:
                     'timing': 'now'
                 }
             else:
+                cue_point = self.current_plan['track_b']['cue_point']
                 return {
-                    'message': f'🎯 Get ready - cue Deck B to {self.current_plan["track_b"]["cue_point"]:.1f}s',
+                    'message': f'🎯 Get ready - cue Deck B to {cue_point:.1f}s',
                     'action': 'cue_deck_b',
                     'urgency': 'medium',
                     'color': 'yellow',
                     'controls': {
                         'deck': 'B',
-                        'cue_point': self.current_plan['track_b']['cue_point']
+                        'cue_point': cue_point
                     },
-                    'timing': f'{int(time_until_transition)}s'
+                    'timing': f'{seconds_until}s'
                 }
         
         # Ready phase - about to start
         elif time_until_transition > 0:
-            bars_until = int(time_until_transition / self.current_plan['transition']['bar_length'])
+            bars_until = int(time_until_transition * self._inv_bar)
+            timing = f'{bars_until} bars'
             
             if not deck_b['playing']:
                 return {
@@ -189,7 +267,7 @@ class DJAdvisor:
                         'action': 'play',
                         'volume': 0  # Start silent, on crossfader
                     },
-                    'timing': f'{bars_until} bars'
+                    'timing': timing
                 }
             else:
                 return {
@@ -198,7 +276,7 @@ class DJAdvisor:
                     'urgency': 'medium',
                     'color': 'yellow',
                     'controls': {},
-                    'timing': f'{bars_until} bars'
+                    'timing': timing
                 }
         
         # In transition - follow timeline
@@ -211,19 +289,11 @@ class DJAdvisor:
         time_in_transition = current_pos - transition_start
         timeline = self.current_plan['timeline']
         
-        # Find current/next event
-        current_event = None
-        next_event = None
-        
-        for i, event in enumerate(timeline):
-            if event['time'] <= time_in_transition:
-                current_event = event
-                if i < len(timeline) - 1:
-                    next_event = timeline[i + 1]
-        
-        if current_event is None:
-            current_event = timeline[0]
-            next_event = timeline[1] if len(timeline) > 1 else None
+        # Find current/next event: the last one already reached (or the
+        # first, if none has been reached yet) and the one after it
+        i = max(bisect_right(self._timeline_times, time_in_transition) - 1, 0)
+        current_event = timeline[i]
+        next_event = timeline[i + 1] if i + 1 < len(timeline) else None
         
         # Generate suggestion based on current event
         message, controls = self._event_to_suggestion(current_event)
@@ -231,37 +301,27 @@ class DJAdvisor:
         # Add timing for next event
         timing = None
         if next_event:
-            time_until_next = next_event['time'] - time_in_transition
-            bars_until = int(time_until_next / self.current_plan['transition']['bar_length'])
+            time_until_next = next_event.time - time_in_transition
+            bars_until = int(time_until_next * self._inv_bar)
             timing = f'Next: {bars_until} bars'
         
         return {
             'message': message,
-            'action': current_event['action'],
+            'action': current_event.action,
             'urgency': 'high',
             'color': 'red',
             'controls': controls,
             'timing': timing,
-            'progress': time_in_transition / self.current_plan['transition']['duration']
+            'progress': time_in_transition * self._inv_duration
         }
     
-    def _event_to_suggestion(self, event: Dict) -> tuple:
+    def _event_to_suggestion(self, event: 'TimelineEvent') -> tuple:
         """Convert timeline event to suggestion"""
         
-        action = event['action']
-        
-        messages = {
-            'start_deck_b': ('▶️ START DECK B', {'deck': 'B', 'play': True}),
-            'eq_low_cut_deck_a_start': ('🎛️ CUT BASS Deck A', {'deck': 'A', 'eq_bass': 0.2}),
-            'eq_low_introduce_deck_b': ('🎛️ BRING BASS Deck B', {'deck': 'B', 'eq_bass': 1.0}),
-            'eq_high_introduce_deck_b': ('🎛️ HIGHS IN Deck B', {'deck': 'B', 'eq_high': 1.0}),
-            'eq_mid_introduce_deck_b': ('🎛️ MIDS IN Deck B', {'deck': 'B', 'eq_mid': 1.0}),
-            'crossfader_50_50': ('🎚️ CROSSFADER CENTER', {'crossfader': 0.0}),
-            'fade_out_deck_a': ('🎚️ FADE OUT Deck A', {'deck': 'A', 'fade_out': True}),
-            'deck_b_only': ('✅ DECK B ONLY - Transition complete!', {})
-        }
-        
-        return messages.get(action, (event['description'], {}))
+        message = self._EVENT_MESSAGES.get(event.action)
+        if message is None:
+            return (event.description, {})
+        return message
     
     def get_energy_advice(self, current_energy: float, next_energy: float) -> str:
         """Suggest how to handle energy transition"""
@@ -1,24 +1,167 @@
 #!/usr/bin/env python3
 """
 Quick Test - Analyze all tracks in data/tracks/test/
+
+Usage: python quick_test.py [--pretty]
+  --pretty  Write the results file indented for reading (default: compact)
 """
 
 import os
 import sys
 import json
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Share compiled Numba kernels (used by librosa) across worker processes and
+# runs via an on-disk cache; must be set before numba is first imported
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path("data/cache/numba").resolve()))
+
 try:
-    from backend.audio_analysis.track_analyzer import TrackAnalyzer
+    from backend.audio_analysis.track_analyzer import TrackAnalyzer, quick_duration
 except ImportError:
     print("Error: Could not import TrackAnalyzer")
     print("Make sure you're in the project root and ran setup.sh")
     sys.exit(1)
 
 
+def file_signature(path: Path) -> tuple:
+    """(mtime in ns, size) of a file, used to spot tracks that changed"""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_cached_results(output_file: Path) -> dict:
+    """Previous results for tracks unchanged since they were analyzed, by file path"""
+    if not output_file.exists():
+        return {}
+    
+    try:
+        with open(output_file, 'r') as f:
+            tracks = json.load(f).get('tracks', [])
+    except (OSError, ValueError):
+        return {}
+    
+    cache = {}
+    for track in tracks:
+        path = Path(track.get('file_path', ''))
+        try:
+            signature = file_signature(path)
+        except OSError:
+            continue
+        if (track.get('mtime_ns'), track.get('file_size')) == signature:
+            cache[str(path)] = track
+    return cache
+
+
+def save_results(output_file: Path, results: list, pretty: bool = False) -> None:
+    """
+    Write the results file, encoded with orjson when it is installed
+    
+    The file is machine-read, so it is compact unless `pretty` is set.
+    """
+    payload = {
+        'total_tracks': len(results),
+        'tracks': results
+    }
+    
+    # Large buffer: the encoder's many small writes become a few syscalls
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(payload, option=option))
+    else:
+        with open(output_file, 'w', buffering=1 << 20) as f:
+            if pretty:
+                json.dump(payload, f, indent=2)
+            else:
+                json.dump(payload, f, separators=(',', ':'))
+
+
+def build_track_table(results: list) -> np.ndarray:
+    """Pack each result's path, tempo, energy, duration and key into a NumPy structured array"""
+    rows = [
+        (r['file_path'], r['bpm'], r.get('energy', np.nan), r['duration'],
+         r.get('key', ''), r.get('scale', ''), r.get('camelot', 'Unknown'))
+        for r in results
+    ]
+    # Text columns are as wide as their longest value, so none is truncated
+    path_width, key_width, scale_width, camelot_width = (
+        max(1, max(len(row[i]) for row in rows)) for i in (0, 4, 5, 6)
+    )
+    dtype = [
+        ('path', f'U{path_width}'),
+        ('bpm', 'f8'),
+        ('energy', 'f8'),      # NaN when the analyzer had no energy estimate
+        ('duration', 'f8'),
+        ('key', f'U{key_width}'),
+        ('scale', f'U{scale_width}'),
+        ('camelot', f'U{camelot_width}'),
+    ]
+    return np.array(rows, dtype=dtype)
+
+
+def save_track_arrays(output_file: Path, results: list, table: np.ndarray) -> None:
+    """
+    Write a binary (.npz) companion of the results file for fast reloads
+    
+    Beat grids differ in length per track, so they are stored flattened:
+    beats[beat_offsets[i]:beat_offsets[i + 1]] are track i's beats.
+    """
+    beat_counts = [len(r.get('beats', ())) for r in results]
+    beat_offsets = np.zeros(len(results) + 1, dtype=np.int64)
+    np.cumsum(beat_counts, out=beat_offsets[1:])
+    beats = np.fromiter(
+        itertools.chain.from_iterable(r.get('beats', ()) for r in results),
+        dtype=np.float64,
+        count=int(beat_offsets[-1])
+    )
+    np.savez(output_file.with_suffix('.npz'), tracks=table, beats=beats, beat_offsets=beat_offsets)
+
+
+# Fields shown in each track's summary, fetched in one call
+_summary_fields = itemgetter('bpm', 'key', 'scale', 'camelot', 'duration')
+
+
+# Per-process analyzer, created on a worker's first track and then reused
+_analyzer = None
+
+
+def silence_worker_output() -> None:
+    """
+    Pool initializer that discards a worker's stdout
+    
+    The analyzer prints its progress, and workers running side by side
+    would scramble the report; the parent prints each track's summary.
+    """
+    sys.stdout = open(os.devnull, 'w')
+
+
+def analyze_track(path_str: str) -> dict:
+    """Analyze one track (runs in a worker process) and record its file signature"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = TrackAnalyzer()
+    result = _analyzer.analyze(path_str)
+    result['mtime_ns'], result['file_size'] = file_signature(Path(path_str))
+    return result
+
+
 def main():
     print("🎧 AI DJ Co-Pilot - Quick Test")
     print("=" * 50)
@@ -49,43 +192,63 @@ def main():
         sys.exit(1)
     
     print(f"Found {len(audio_files)} track(s) to analyze")
+    
+    # Library length from the file headers, before any decoding
+    durations = [d for d in map(quick_duration, map(str, audio_files)) if d is not None]
+    if durations:
+        print(f"Library length: {sum(durations) / 60:.1f} min "
+              f"({len(durations)}/{len(audio_files)} tracks read from file headers)")
     print()
     
-    # Analyze all tracks
-    analyzer = TrackAnalyzer()
+    # Analyze all tracks, reusing saved results for unchanged files
+    output_file = Path("data/cache/quick_test_results.json")
+    cache = load_cached_results(output_file)
+    pending = [p for p in audio_files if str(p) not in cache]
     results = []
     
-    for i, audio_path in enumerate(audio_files, 1):
-        print(f"[{i}/{len(audio_files)}] {audio_path.name}")
-        print("-" * 50)
+    # Tracks are independent, so analyze them in parallel worker processes.
+    # Spawn rather than fork: forking after the audio libraries have loaded
+    # their native state can crash the workers.
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(len(pending), os.cpu_count() or 1)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=silence_worker_output
+    ) as executor:
+        futures = {p: executor.submit(analyze_track, str(p)) for p in pending}
         
-        try:
-            result = analyzer.analyze(str(audio_path))
-            results.append(result)
-            
-            # Print summary
-            print(f"  BPM: {result['bpm']:.1f}")
-            print(f"  Key: {result['key']} {result['scale']} ({result['camelot']})")
-            print(f"  Duration: {result['duration']:.1f}s")
-            if 'energy' in result:
-                print(f"  Energy: {result['energy']:.3f}")
-            print()
+        # Report in file order; each track waits only for its own worker
+        for i, audio_path in enumerate(audio_files, 1):
+            print(f"[{i}/{len(audio_files)}] {audio_path.name}")
+            print("-" * 50)
             
-        except Exception as e:
-            print(f"  ✗ ERROR: {e}")
-            print()
-            continue
+            try:
+                if audio_path in futures:
+                    result = futures[audio_path].result()
+                else:
+                    result = cache[str(audio_path)]
+                    print("  (cached - unchanged since last run)")
+                results.append(result)
+                
+                # Print summary
+                bpm, key, scale, camelot, duration = _summary_fields(result)
+                print(f"  BPM: {bpm:.1f}")
+                print(f"  Key: {key} {scale} ({camelot})")
+                print(f"  Duration: {duration:.1f}s")
+                if 'energy' in result:
+                    print(f"  Energy: {result['energy']:.3f}")
+                print()
+                
+            except Exception as e:
+                print(f"  ✗ ERROR: {e}")
+                print()
+                continue
     
     # Save results
     if results:
-        output_file = Path("data/cache/quick_test_results.json")
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w') as f:
-            json.dump({
-                'total_tracks': len(results),
-                'tracks': results
-            }, f, indent=2)
+        save_results(output_file, results, pretty='--pretty' in sys.argv[1:])
+        table = build_track_table(results)
+        save_track_arrays(output_file, results, table)
         
         print("=" * 50)
         print(f"✓ Analyzed {len(results)}/{len(audio_files)} tracks successfully")
@@ -96,24 +259,21 @@ def main():
         if len(results) >= 2:
             print("Compatibility Matrix (BPM difference):")
             print("-" * 50)
-            for i, track_a in enumerate(results):
-                name_a = Path(track_a['file_path']).stem[:20]
-                for j, track_b in enumerate(results):
-                    if i >= j:
-                        continue
-                    name_b = Path(track_b['file_path']).stem[:20]
-                    bpm_diff = abs(track_a['bpm'] - track_b['bpm'])
-                    
-                    # Simple compatibility
-                    if bpm_diff <= 6:
-                        compat = "🟢 Perfect"
-                    elif bpm_diff <= 12:
-                        compat = "🟡 Good"
-                    else:
-                        compat = "🔴 Difficult"
-                    
-                    print(f"  {name_a:20s} ↔ {name_b:20s} | ΔBPM: {bpm_diff:4.1f} | {compat}")
-            print()
+            names = [Path(path).stem[:20] for path in table['path']]
+            bpms = table['bpm']
+            bpm_diff = np.abs(np.subtract.outer(bpms, bpms))
+            
+            # Simple compatibility: <= 6 BPM perfect, <= 12 good, else difficult.
+            # side='left' puts a diff equal to a boundary in the lower tier.
+            tiers = np.searchsorted(np.array([6.0, 12.0]), bpm_diff, side='left')
+            compat = np.take(np.array(["🟢 Perfect", "🟡 Good", "🔴 Difficult"]), tiers)
+            
+            # One write for the whole matrix instead of a print() per pair
+            lines = [
+                f"  {names[i]:20s} ↔ {names[j]:20s} | ΔBPM: {bpm_diff[i, j]:4.1f} | {compat[i, j]}"
+                for i, j in zip(*np.triu_indices(len(results), 1))
+            ]
+            sys.stdout.write("\n".join(lines) + "\n\n")
     else:
         print("✗ No tracks analyzed successfully")
         sys.exit(1)
@@ -18,31 +18,43 @@ mixer.start()
 
 # Generate test tones (left = 440Hz, right = 880Hz)
 sample_rate = 44100
-duration = 30  # 30 seconds
+duration = 1  # 1 second, looped by the decks
+
+
+def make_stereo_tone(freq):
+    """Generate one second of a float32 sine on both channels"""
+    # Whole-Hz tones complete a whole number of cycles every second, so the
+    # deck can loop this buffer without a click (and the float32 phase
+    # stays small enough to be precise)
+    phase = np.arange(sample_rate * duration, dtype=np.float32)
+    phase *= np.float32(2 * np.pi * freq / sample_rate)
+    mono = np.sin(phase, out=phase)
+    mono *= np.float32(0.3)
+    return np.repeat(mono[:, None], 2, axis=1)
+
 
 # Tone A: 440Hz (A note)
-t = np.linspace(0, duration, int(sample_rate * duration))
-tone_a = np.sin(2 * np.pi * 440 * t) * 0.3
-tone_a_stereo = np.column_stack([tone_a, tone_a])
+tone_a_stereo = make_stereo_tone(440)
 
 # Tone B: 880Hz (A note, one octave higher)
-tone_b = np.sin(2 * np.pi * 880 * t) * 0.3
-tone_b_stereo = np.column_stack([tone_b, tone_b])
+tone_b_stereo = make_stereo_tone(880)
 
 # Load tones into decks
 print("\n📝 Loading test tones...")
 print("   Deck A: 440 Hz (low tone)")
 print("   Deck B: 880 Hz (high tone)")
 
-mixer.deck_a.audio = tone_a_stereo.astype(np.float32)
+mixer.deck_a.audio = tone_a_stereo
 mixer.deck_a.sample_rate = sample_rate
 mixer.deck_a.duration = duration
 mixer.deck_a.track_path = "Test Tone A (440Hz)"
+mixer.deck_a.set_loop(0.0, duration)
 
-mixer.deck_b.audio = tone_b_stereo.astype(np.float32)
+mixer.deck_b.audio = tone_b_stereo
 mixer.deck_b.sample_rate = sample_rate
 mixer.deck_b.duration = duration
 mixer.deck_b.track_path = "Test Tone B (880Hz)"
+mixer.deck_b.set_loop(0.0, duration)
 
 # Start both decks
 print("\n▶️  Starting both decks...")
@@ -61,14 +73,14 @@ positions = [
     (1.0, "Full RIGHT (only 880 Hz - high tone)"),
 ]
 
-for cf_value, description in positions:
+# Equal-power levels for every position, computed in one pass:
+# levels[i] = (deck A level, deck B level)
+cf_pos = (np.array([cf for cf, _ in positions]) + 1) / 2
+levels = np.stack([np.cos(cf_pos * np.pi / 2), np.sin(cf_pos * np.pi / 2)], axis=1)
+
+for (cf_value, description), (a_level, b_level) in zip(positions, levels):
     mixer.set_crossfader(cf_value)
     
-    # Calculate levels
-    cf_pos = (cf_value + 1) / 2
-    a_level = np.cos(cf_pos * np.pi / 2)
-    b_level = np.sin(cf_pos * np.pi / 2)
-    
     print(f"   CF={cf_value:+.1f} → A:{a_level*100:5.1f}% B:{b_level*100:5.1f}% | {description}")
     time.sleep(3)
 
@@ -17,39 +17,50 @@ from pathlib import Path
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-print("🎧 AI DJ Co-Pilot - Full System Test")
-print("=" * 60)
-print()
-
-# Test 1: Check imports
-print("Step 1: Checking imports...")
-print("-" * 60)
-
-try:
-    from backend.audio_analysis.track_analyzer import TrackAnalyzer
-    print("✓ TrackAnalyzer imported")
-except ImportError as e:
-    print(f"✗ TrackAnalyzer import failed: {e}")
-    sys.exit(1)
 
-try:
-    from backend.queue_manager.queue import QueueManager
-    print("✓ QueueManager imported")
-except ImportError as e:
-    print(f"✗ QueueManager import failed: {e}")
-    sys.exit(1)
+def load_tracks(cache_file: Path) -> list:
+    """
+    Load the analyzed tracks, preferring quick_test's binary companion
+    (.npz) over re-parsing the JSON when it is at least as new
+    """
+    arrays_file = cache_file.with_suffix('.npz')
+    if not arrays_file.exists() or arrays_file.stat().st_mtime_ns < cache_file.stat().st_mtime_ns:
+        with open(cache_file, 'r') as f:
+            return json.load(f).get('tracks', [])
+    
+    import numpy as np
+    
+    with np.load(arrays_file) as data:
+        table = data['tracks']
+        beats = data['beats']
+        offsets = data['beat_offsets']
+    
+    tracks = []
+    for i, row in enumerate(table):
+        track = {
+            'file_path': str(row['path']),
+            'bpm': float(row['bpm']),
+            'duration': float(row['duration']),
+            'key': str(row['key']),
+            'scale': str(row['scale']),
+            'camelot': str(row['camelot']),
+            'beats': beats[offsets[i]:offsets[i + 1]]  # View, no copy
+        }
+        if not np.isnan(row['energy']):
+            track['energy'] = float(row['energy'])
+        tracks.append(track)
+    return tracks
 
-try:
-    from backend.queue_manager.transition_planner import TransitionPlanner
-    print("✓ TransitionPlanner imported")
-except ImportError as e:
-    print(f"✗ TransitionPlanner import failed: {e}")
-    sys.exit(1)
 
+print("🎧 AI DJ Co-Pilot - Full System Test")
+print("=" * 60)
 print()
 
-# Test 2: Load analyzed tracks
-print("Step 2: Loading track library...")
+# Imports happen in the step that first needs them, so a missing library
+# fails fast without pulling in the analysis stack (librosa/numba)
+
+# Test 1: Load analyzed tracks
+print("Step 1: Loading track library...")
 print("-" * 60)
 
 cache_file = Path("data/cache/quick_test_results.json")
@@ -59,9 +70,14 @@ if not cache_file.exists():
     print()
     sys.exit(1)
 
-with open(cache_file, 'r') as f:
-    data = json.load(f)
-    tracks = data.get('tracks', [])
+try:
+    from backend.audio_analysis.track_analyzer import TrackAnalyzer
+    print("✓ TrackAnalyzer imported")
+except ImportError as e:
+    print(f"✗ TrackAnalyzer import failed: {e}")
+    sys.exit(1)
+
+tracks = load_tracks(cache_file)
 
 if len(tracks) < 2:
     print(f"✗ Need at least 2 tracks, found {len(tracks)}")
@@ -69,22 +85,38 @@ if len(tracks) < 2:
     print()
     sys.exit(1)
 
-print(f"✓ Loaded {len(tracks)} track(s)")
+# Display names, parsed from each path once
+names = {}
+stems = {}
 for track in tracks:
-    name = Path(track['file_path']).name
-    print(f"  - {name}: {track['bpm']:.1f} BPM, {track['camelot']}")
+    path = Path(track['file_path'])
+    names[track['file_path']] = path.name
+    stems[track['file_path']] = path.stem[:25]
+
+print(f"✓ Loaded {len(tracks)} track(s)")
+sys.stdout.write("".join(
+    f"  - {names[track['file_path']]}: {track['bpm']:.1f} BPM, {track['camelot']}\n"
+    for track in tracks
+))
 print()
 
-# Test 3: Queue Manager
-print("Step 3: Testing Queue Manager...")
+# Test 2: Queue Manager
+print("Step 2: Testing Queue Manager...")
 print("-" * 60)
 
+try:
+    from backend.queue_manager.queue import QueueManager
+    print("✓ QueueManager imported")
+except ImportError as e:
+    print(f"✗ QueueManager import failed: {e}")
+    sys.exit(1)
+
 qm = QueueManager()
 
 # Set current track
 current_track = tracks[0]
 qm.set_current_track(current_track)
-print(f"✓ Set current track: {Path(current_track['file_path']).name}")
+print(f"✓ Set current track: {names[current_track['file_path']]}")
 
 # Add remaining tracks to queue
 for track in tracks[1:]:
@@ -97,27 +129,31 @@ print("Next track suggestions:")
 suggestions = qm.get_next_track(count=min(3, len(tracks) - 1))
 
 for i, (track, score) in enumerate(suggestions, 1):
-    name = Path(track['file_path']).name
     rating = qm._score_to_rating(score)
-    print(f"  {i}. {name}")
+    print(f"  {i}. {names[track['file_path']]}")
     print(f"     BPM: {track['bpm']:.1f}, Key: {track['camelot']}")
     print(f"     Compatibility: {score:.2%} {rating}")
     print()
 
 # Get compatibility matrix
 print("Compatibility Matrix:")
-matrix = qm.get_compatibility_matrix()
-for entry in matrix[:5]:  # Show top 5
-    name_a = Path(entry['track_a']).stem[:25]
-    name_b = Path(entry['track_b']).stem[:25]
-    print(f"  {name_a} ↔ {name_b}")
+matrix = qm.get_compatibility_matrix(top_k=5)  # Only the 5 best pairs are built
+for entry in matrix:
+    print(f"  {stems[entry['track_a']]} ↔ {stems[entry['track_b']]}")
     print(f"    ΔBPM: {entry['bpm_diff']:.1f} | Score: {entry['score']:.2%} {entry['rating']}")
 print()
 
-# Test 4: Transition Planner
-print("Step 4: Testing Transition Planner...")
+# Test 3: Transition Planner
+print("Step 3: Testing Transition Planner...")
 print("-" * 60)
 
+try:
+    from backend.queue_manager.transition_planner import TransitionPlanner
+    print("✓ TransitionPlanner imported")
+except ImportError as e:
+    print(f"✗ TransitionPlanner import failed: {e}")
+    sys.exit(1)
+
 tp = TransitionPlanner()
 
 # Plan a transition
@@ -128,11 +164,11 @@ if len(tracks) >= 2:
     plan = tp.plan_transition(track_a, track_b, transition_type='standard')
     
     print(f"Transition Plan:")
-    print(f"  Track A: {Path(track_a['file_path']).name}")
+    print(f"  Track A: {names[track_a['file_path']]}")
     print(f"    Start mixing at: {plan['track_a']['transition_start']:.1f}s (bar {plan['track_a']['transition_start_bars']})")
     print()
     
-    print(f"  Track B: {Path(track_b['file_path']).name}")
+    print(f"  Track B: {names[track_b['file_path']]}")
     print(f"    Cue point: {plan['track_b']['cue_point']:.1f}s (bar {plan['track_b']['cue_point_bars']})")
     print()
     
@@ -143,11 +179,11 @@ if len(tracks) >= 2:
     
     print(f"  Timeline (first 5 events):")
     for event in plan['timeline'][:5]:
-        print(f"    Beat {event['beat']:3d} ({event['time']:5.1f}s): {event['description']}")
+        print(f"    Beat {event.beat:3d} ({event.time:5.1f}s): {event.description}")
     print()
 
-# Test 5: Summary
-print("Step 5: System Status")
+# Test 4: Summary
+print("Step 4: System Status")
 print("-" * 60)
 print("✓ All components working!")
 print()